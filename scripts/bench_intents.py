@@ -0,0 +1,154 @@
+"""
+Measure memory and event throughput of the "cogs" and "all" intent profiles
+under a synthetic event flood, without connecting to Discord.
+
+A fake gateway feeds PRESENCE_UPDATE, TYPING_START, GUILD_MEMBER_ADD and
+MESSAGE_CREATE payloads through the bot's ConnectionState, dropping events the
+profile has not subscribed to (as Discord's gateway does). Cogs are not loaded,
+so this measures parsing, caching and dispatch, not the cogs' own handlers.
+
+Usage: uv run scripts/bench_intents.py [events]
+"""
+
+import asyncio
+import itertools
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+os.environ.setdefault("DISCORD_TOKEN", "bench-token")
+
+import discord  # noqa: E402
+
+import main  # noqa: E402
+
+GUILD_ID = 1 << 22
+CHANNEL_ID = GUILD_ID + 1
+USERS = 5000
+TIMESTAMP = "2026-01-01T00:00:00+00:00"
+
+# Intent Discord requires before it sends each event
+EVENT_INTENTS = {
+    "PRESENCE_UPDATE": "presences",
+    "TYPING_START": "guild_typing",
+    "GUILD_MEMBER_ADD": "members",
+    "MESSAGE_CREATE": "guild_messages",
+}
+
+
+def user(user_id: int) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0",
+        "avatar": None,
+    }
+
+
+def member(user_id: int) -> dict:
+    return {
+        "user": user(user_id),
+        "roles": [],
+        "joined_at": TIMESTAMP,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def payloads():
+    """Yield (event, payload) pairs forever, cycling through the event types."""
+    for seq in itertools.count():
+        user_id = 10_000 + seq % USERS
+        yield "PRESENCE_UPDATE", {
+            "user": {"id": str(user_id)},
+            "guild_id": str(GUILD_ID),
+            "status": "online",
+            "activities": [],
+            "client_status": {"desktop": "online"},
+        }
+        yield "TYPING_START", {
+            "channel_id": str(CHANNEL_ID),
+            "guild_id": str(GUILD_ID),
+            "user_id": str(user_id),
+            "timestamp": 0,
+            "member": member(user_id),
+        }
+        yield "GUILD_MEMBER_ADD", {**member(user_id), "guild_id": str(GUILD_ID)}
+        yield "MESSAGE_CREATE", {
+            "id": str(CHANNEL_ID + 1 + seq),
+            "channel_id": str(CHANNEL_ID),
+            "guild_id": str(GUILD_ID),
+            "author": user(user_id),
+            "member": {k: v for k, v in member(user_id).items() if k != "user"},
+            "content": "synthetic message " * 5,
+            "timestamp": TIMESTAMP,
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": [],
+            "pinned": False,
+            "type": 0,
+        }
+
+
+async def run(profile: str, events: int) -> None:
+    main.GATEWAY_INTENTS = profile
+    bot = main.create_bot()
+    async with bot:
+        state = bot._connection
+        # there is no websocket to request member chunks over, or READY to set the bot user
+        state._chunk_guilds = False
+        state.user = discord.ClientUser(state=state, data={**user(1), "bot": True})
+        state.parse_guild_create(
+            {
+                "id": str(GUILD_ID),
+                "name": "bench",
+                "channels": [
+                    {"id": str(CHANNEL_ID), "type": 0, "name": "general", "position": 0}
+                ],
+                "roles": [],
+                "member_count": USERS,
+                "unavailable": False,
+            }
+        )
+        intents = bot.intents
+
+        tracemalloc.start()
+        delivered = 0
+        start = time.perf_counter()
+        for event, payload in itertools.islice(payloads(), events):
+            if not getattr(intents, EVENT_INTENTS[event]):
+                continue
+            state.parsers[event](payload)
+            delivered += 1
+            if delivered % 1000 == 0:
+                await asyncio.sleep(0)  # let dispatched events run
+        await asyncio.sleep(0)
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        guild = bot.get_guild(GUILD_ID)
+        print(
+            f"{profile:>4}: {delivered}/{events} events delivered, flood handled in "
+            f"{elapsed:.2f}s ({events / elapsed:,.0f} events/s), {current / 1e6:.1f}MB retained, "
+            f"{peak / 1e6:.1f}MB peak, {len(guild.members) if guild else 0} members "
+            f"and {len(bot.cached_messages)} messages cached"
+        )
+
+
+async def bench(events: int) -> None:
+    for profile in ("all", "cogs"):
+        await run(profile, events)
+
+
+if __name__ == "__main__":
+    discord.utils.setup_logging(level=40)
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
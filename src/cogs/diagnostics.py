@@ -0,0 +1,47 @@
+import logging
+
+import discord
+from discord.ext import commands
+
+from utils import loop_watchdog, outbound_dispatcher
+
+logger = logging.getLogger(__name__)
+
+# Gateway events this cog listens to: owner commands in guilds and DMs
+INTENTS = discord.Intents(
+    guilds=True,
+    guild_messages=True,
+    dm_messages=True,
+    message_content=True,
+)
+
+
+class Diagnostics(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command()
+    @commands.is_owner()
+    async def profile(self, ctx: commands.Context, seconds: float = 10) -> None:
+        """
+        Sample the event loop and write a folded profile, owner only.
+        Args:
+            ctx: The command context.
+            seconds: The number of seconds to sample for, capped at PROFILE_MAX_DURATION.
+        """
+        await ctx.reply("Profiling event loop")
+        path, duration = await loop_watchdog.profile(seconds)
+        lag = loop_watchdog.get_lag_stats()
+        queued = sum(
+            metrics["depth"] for metrics in outbound_dispatcher.get_metrics().values()
+        )
+        await ctx.reply(
+            f"Profiled {duration:g}s, written to {path.name}\n"
+            f"Loop lag: last {lag['last'] * 1000:.1f}ms, max {lag['max'] * 1000:.1f}ms, "
+            f"{lag['stalls']} stalls\n"
+            f"Queued outbound messages: {queued}"
+        )
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Diagnostics(bot))
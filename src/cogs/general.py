@@ -5,7 +5,7 @@ import discord
 from discord.ext import commands
 from translate import Translator
 
-from utils import constants
+from utils import constants, outbound_dispatcher
 
 logger = logging.getLogger(__name__)
 CONFIG_PATH = constants.ROOT_DIR / "variables.toml"
@@ -15,6 +15,16 @@ USER_IDS = config["USER_IDS"]
 CHANNEL_IDS = config["CHANNEL_IDS"]
 channel_name = config["SETTINGS"]["channel_name"]
 
+# Gateway events this cog listens to: commands, DMs, deleted messages and reactions
+INTENTS = discord.Intents(
+    guilds=True,
+    guild_messages=True,
+    dm_messages=True,
+    message_content=True,
+    guild_reactions=True,
+    dm_reactions=True,
+)
+
 
 class General(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -24,7 +34,7 @@ class General(commands.Cog):
     async def help(self, ctx: commands.Context) -> None:
         """Show help message."""
         await ctx.reply(
-            "Commands: play <name/id> (channel), stop_playing, join, leave, audios, vol <name> <volume>"
+            "Commands: play <name/id> (channel), stream <name/id/url> (channel), stop_playing, join, leave, audios, vol <name> <volume>, stats"
         )
 
     @commands.command()
@@ -45,7 +55,15 @@ class General(commands.Cog):
             await ctx.reply(str(set(USER_IDS.keys())))
             return
 
-        channel = self.bot.get_channel(CHANNEL_IDS[channel_name])
+        channel_id = CHANNEL_IDS[channel_name]
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            # not cached when the channel's guild belongs to another shard
+            try:
+                channel = await self.bot.fetch_channel(channel_id)
+            except discord.HTTPException as e:
+                logger.error(f"Failed to fetch channel {channel_id}: {e}")
+                return
         if not isinstance(channel, (discord.TextChannel, discord.DMChannel)):
             logger.error("Invalid channel")
             return
@@ -133,7 +151,7 @@ class General(commands.Cog):
             to_lang = constants.COUNTRY_FLAGS[payload.emoji.name]
             logger.info(f"Translating '{msg.content}' to {to_lang}")
             translation = Translator(to_lang=to_lang).translate(msg.content)
-            await msg.reply(translation)
+            outbound_dispatcher.enqueue(msg.channel, translation, reference=msg)
 
     @commands.Cog.listener()
     async def on_message(self, msg: discord.Message) -> None:
@@ -160,15 +178,13 @@ class General(commands.Cog):
                             content += "\n" + " ".join([a.url for a in msg.attachments])
 
                         if content:
-                            await fsg_user.send(f"DM from {sender_name}: {content}")
+                            outbound_dispatcher.enqueue(
+                                fsg_user, f"DM from {sender_name}: {content}"
+                            )
                         else:
                             logger.warning(
                                 f"Received empty DM from {sender_name} with no attachments"
                             )
-                except discord.Forbidden:
-                    logger.error(
-                        "Failed to forward DM: Forbidden. Check if the target user has DMs enabled."
-                    )
                 except Exception as e:
                     logger.error(f"Failed to forward DM: {e}")
 
@@ -177,7 +193,7 @@ class General(commands.Cog):
             logger.info(f"Command received: {msg.content}")
             if ctx.command:
                 command_name = ctx.command.name
-                if command_name in ["play", "join", "leave", "stop"]:
+                if command_name in ["play", "stream", "join", "leave", "stop"]:
                     await msg.delete()
                 elif (
                     command_name == "vol" and len(msg.content.split()) > 2
@@ -199,7 +215,17 @@ class General(commands.Cog):
             return
 
         deleted_message = f"{msg.author.display_name} just recalled:\n{msg.content}"
-        await msg.channel.send(deleted_message)
+        outbound_dispatcher.enqueue(msg.channel, deleted_message)
+
+    @commands.Cog.listener()
+    async def on_bulk_message_delete(self, msgs: list[discord.Message]) -> None:
+        """
+        Echo bulk deleted messages, merged into as few messages as possible.
+        Args:
+            msgs: The deleted message objects.
+        """
+        for msg in msgs:
+            await self.on_message_delete(msg)
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -1,14 +1,23 @@
 import asyncio
 import logging
+import time
 
 import discord
 from discord.ext import commands
 
-from utils import audio_playback_handler, constants, volume_manager
+from utils import audio_playback_handler, constants, play_log, volume_manager
 
 logger = logging.getLogger(__name__)
 command_lock = asyncio.Lock()
 
+# Gateway events this cog listens to: commands and voice channel joins
+INTENTS = discord.Intents(
+    guilds=True,
+    guild_messages=True,
+    message_content=True,
+    voice_states=True,
+)
+
 
 class Music(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -25,12 +34,18 @@ class Music(commands.Cog):
             audio_name: The name of the audio to play.
             channel: Optional voice channel to join.
         """
+        requested_at = time.perf_counter()
         async with command_lock:
             if ctx.author.bot or not audio_playback_handler.resolve_audio_name(
                 audio_name
             ):
                 return
 
+            if isinstance(
+                ctx.voice_client, discord.VoiceClient
+            ) and audio_playback_handler.is_streaming(ctx.voice_client):
+                await ctx.reply("A stream is playing, use !stop first.")
+                return
             # execute command after current audio finishes
             if (
                 isinstance(ctx.voice_client, discord.VoiceClient)
@@ -76,13 +91,96 @@ class Music(commands.Cog):
                 bot_voice_client = await voice_channel.connect()
 
             if isinstance(bot_voice_client, discord.VoiceClient):
-                await audio_playback_handler.play_audio(bot_voice_client, audio_name)
+                await audio_playback_handler.play_audio(
+                    bot_voice_client, audio_name, play_log.PLAY, requested_at
+                )
 
                 if prev_voice_channel is not None:
                     await bot_voice_client.move_to(prev_voice_channel)
                 else:
                     await bot_voice_client.disconnect()
 
+    @commands.command()
+    async def stream(
+        self, ctx: commands.Context, source: str, channel: str | None = None
+    ) -> None:
+        """
+        Stream a long audio file or an http(s) URL in a voice channel.
+        Args:
+            ctx: The command context.
+            source: The name of the audio to play, or a URL.
+            channel: Optional voice channel to join.
+        """
+        if ctx.author.bot:
+            return
+
+        # buffer before taking the lock, a slow URL must not hold up other commands
+        audio_player = await audio_playback_handler.open_stream(source)
+        if audio_player is None:
+            return
+
+        started = False
+        bot_voice_client = None
+        prev_voice_channel = None
+        try:
+            async with command_lock:
+                author = ctx.author
+                if isinstance(author, discord.Member) and author.voice:
+                    author_voice_channel = author.voice.channel
+                else:
+                    author_voice_channel = None
+
+                if channel:
+                    if not ctx.guild:
+                        return
+                    voice_channel = discord.utils.get(
+                        ctx.guild.voice_channels, name=channel
+                    )
+                else:
+                    voice_channel = (
+                        ctx.voice_client.channel
+                        if isinstance(ctx.voice_client, discord.VoiceClient)
+                        else author_voice_channel
+                    )
+
+                if voice_channel is None:
+                    return
+
+                # go back (or leave) to previous channel after playing audio
+                bot_voice_client = ctx.voice_client
+                if isinstance(bot_voice_client, discord.VoiceClient):
+                    prev_voice_channel = bot_voice_client.channel
+
+                if (
+                    isinstance(bot_voice_client, discord.VoiceClient)
+                    and bot_voice_client.channel != voice_channel
+                ):
+                    await bot_voice_client.move_to(voice_channel)
+                elif not bot_voice_client:
+                    bot_voice_client = await voice_channel.connect()
+
+                if isinstance(bot_voice_client, discord.VoiceClient):
+                    started = audio_playback_handler.start_stream(
+                        bot_voice_client, audio_player
+                    )
+
+            # wait without the lock, a long stream must not hold up plays and
+            # greetings; they skip this guild while the stream is playing
+            if started and isinstance(bot_voice_client, discord.VoiceClient):
+                await audio_playback_handler.wait_for_playback(bot_voice_client)
+        finally:
+            if not started:
+                await audio_playback_handler.close_stream(audio_player)
+            if (
+                isinstance(bot_voice_client, discord.VoiceClient)
+                and bot_voice_client.is_connected()
+            ):
+                async with command_lock:
+                    if prev_voice_channel is not None:
+                        await bot_voice_client.move_to(prev_voice_channel)
+                    else:
+                        await bot_voice_client.disconnect()
+
     @commands.command()
     async def replay(
         self, ctx: commands.Context, audio_name: str | None = None, count: int = 0
@@ -97,6 +195,7 @@ class Music(commands.Cog):
         if count == 0:
             return
 
+        requested_at = time.perf_counter()
         async with command_lock:
             if (
                 ctx.author.bot
@@ -104,6 +203,11 @@ class Music(commands.Cog):
                 or not audio_playback_handler.resolve_audio_name(audio_name)
             ):
                 return
+            if isinstance(
+                ctx.voice_client, discord.VoiceClient
+            ) and audio_playback_handler.is_streaming(ctx.voice_client):
+                await ctx.reply("A stream is playing, use !stop first.")
+                return
             # execute command after current audio finishes
             if (
                 isinstance(ctx.voice_client, discord.VoiceClient)
@@ -143,9 +247,13 @@ class Music(commands.Cog):
 
             try:
                 if isinstance(bot_voice_client, discord.VoiceClient):
-                    for _ in range(count):
+                    for i in range(count):
                         keep_playing = await audio_playback_handler.play_audio(
-                            bot_voice_client, audio_name
+                            bot_voice_client,
+                            audio_name,
+                            play_log.REPLAY,
+                            # only the first play's latency is the command's
+                            requested_at if i == 0 else None,
                         )
                         if not keep_playing:
                             logger.info("Replay stopped")
@@ -213,6 +321,27 @@ class Music(commands.Cog):
         """List all available audio files."""
         await ctx.reply(constants.AUDIO_LIST)
 
+    @commands.command()
+    async def stats(self, ctx: commands.Context) -> None:
+        """Show the most played audios and play command latencies in this server."""
+        stats = await play_log.get_stats(ctx.guild.id if ctx.guild else None)
+        if not stats["plays"]:
+            await ctx.reply("No plays recorded yet.")
+            return
+
+        top = "\n".join(
+            f"{idx + 1}. {name} ({count})"
+            for idx, (name, count) in enumerate(stats["top"])
+        )
+        reply = f"{stats['plays']} plays\n{top}"
+        latency = stats["latency"]
+        if latency:
+            reply += (
+                f"\nLatency: p50 {latency['p50'] * 1000:.0f}ms, "
+                f"p90 {latency['p90'] * 1000:.0f}ms, p99 {latency['p99'] * 1000:.0f}ms"
+            )
+        await ctx.reply(reply)
+
     @commands.command()
     async def leave(self, ctx):
         # check if the bot is in a voice channel
@@ -250,12 +379,20 @@ class Music(commands.Cog):
                 bot_voice_client = voice_client
                 break
 
+        # don't cut off a stream to greet someone
+        if bot_voice_client and audio_playback_handler.is_streaming(bot_voice_client):
+            return
         if bot_voice_client and bot_voice_client.is_playing():
             bot_voice_client.stop()
 
         async with command_lock:
             if bot_voice_client and not bot_voice_client.is_connected():
                 bot_voice_client = None
+            # a stream may have started while waiting for the lock
+            if bot_voice_client and audio_playback_handler.is_streaming(
+                bot_voice_client
+            ):
+                return
 
             prev_bot_voice_channel = (
                 bot_voice_client.channel if bot_voice_client else None
@@ -267,7 +404,9 @@ class Music(commands.Cog):
                 await bot_voice_client.move_to(after.channel)
 
             await asyncio.sleep(1.5)  # wait for user to connect to voice channel
-            await audio_playback_handler.play_audio(bot_voice_client, "nihao")
+            await audio_playback_handler.play_audio(
+                bot_voice_client, "nihao", play_log.GREETING
+            )
 
             # Go back to previous channel if exists
             if prev_bot_voice_channel:
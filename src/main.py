@@ -1,4 +1,6 @@
+import ast
 import logging
+import multiprocessing
 import os
 import asyncio
 
@@ -6,43 +8,193 @@ import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
-from utils import volume_manager
-from utils.constants import ROOT_DIR
+from utils import loop_watchdog, play_log, shared_state, volume_manager
+from utils.constants import COGS_DIR, ROOT_DIR
 
 # Logging config
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    format="%(asctime)s [%(levelname)s] %(processName)s %(name)s: %(message)s",
 )
+logger = logging.getLogger(__name__)
 
-# Initialize bot
 COMMAND_PREFIX = "!"
-bot = commands.Bot(command_prefix=COMMAND_PREFIX, intents=discord.Intents.all())
-bot.remove_command("help")
 
-# Initialize volumes
-volume_manager.fetch_and_initialize_volumes()
-
-# Start bot
+# Load environment
 dotenv_path = ROOT_DIR / ".env"
 load_dotenv(dotenv_path)
 TOKEN = os.getenv("DISCORD_TOKEN")
 if TOKEN is None:
     raise RuntimeError("DISCORD_TOKEN not found in environment variables")
+# Number of shard worker processes, 0 runs a single unsharded bot
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+# "cogs" subscribes only to the intents the loaded cogs declare, "all" to every intent
+GATEWAY_INTENTS = os.getenv("GATEWAY_INTENTS", "cogs")
+# Number of messages kept in cache, needed to echo deleted messages
+MAX_MESSAGES = int(os.getenv("MAX_MESSAGES", "1000"))
+# Seconds to wait for shard workers to exit before terminating them
+SHARD_SHUTDOWN_TIMEOUT = 10
+
+
+def cog_extensions() -> list[str]:
+    """
+    List the cog extensions to load.
+    Returns:
+        The extension names, e.g. "cogs.music".
+    """
+    return [
+        f"cogs.{filename[:-3]}"
+        for filename in sorted(os.listdir(COGS_DIR))
+        if filename.endswith(".py") and filename != "__init__.py"
+    ]
+
+
+def declared_intents(extension: str) -> discord.Intents | None:
+    """
+    Read a cog's INTENTS without importing it. Importing here would run the
+    module twice, since load_extension executes it again.
+    INTENTS must be a module-level discord.Intents(...) call with literal keyword flags.
+    Args:
+        extension: The extension name, e.g. "cogs.music".
+    Returns:
+        The declared intents, or None if the cog does not declare any.
+    """
+    path = COGS_DIR / f"{extension.removeprefix('cogs.')}.py"
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == "INTENTS" for t in node.targets)
+            and isinstance(node.value, ast.Call)
+        ):
+            return discord.Intents(
+                **{kw.arg: ast.literal_eval(kw.value) for kw in node.value.keywords}
+            )
+    return None
+
+
+def required_intents() -> discord.Intents:
+    """
+    Combine the INTENTS declared by every cog, so the gateway does not send
+    (and the cache does not keep) presences, typing events or member lists
+    that no cog uses.
+    Returns:
+        The intents to connect with.
+    """
+    if GATEWAY_INTENTS == "all":
+        return discord.Intents.all()
+    intents = discord.Intents.none()
+    for extension in cog_extensions():
+        cog_intents = declared_intents(extension)
+        if cog_intents is None:
+            logger.warning(f"{extension} does not declare INTENTS, using all intents")
+            return discord.Intents.all()
+        intents |= cog_intents
+    return intents
+
 
+def create_bot(
+    shard_id: int | None = None, shard_count: int | None = None
+) -> commands.Bot:
+    """
+    Create the bot, optionally restricted to a single shard.
+    Args:
+        shard_id: The shard handled by this process.
+        shard_count: The total number of shards.
+    Returns:
+        The bot.
+    """
+    intents = required_intents()
+    logger.info(f"Gateway intents: {', '.join(name for name, on in intents if on)}")
+    bot = commands.Bot(
+        command_prefix=COMMAND_PREFIX,
+        intents=intents,
+        member_cache_flags=discord.MemberCacheFlags.from_intents(intents),
+        max_messages=MAX_MESSAGES,
+        shard_id=shard_id,
+        shard_count=shard_count,
+    )
+    bot.remove_command("help")
+    return bot
 
-async def load_extensions():
-    cogs_dir = ROOT_DIR / "src" / "cogs"
-    for filename in os.listdir(cogs_dir):
-        if filename.endswith(".py") and filename != "__init__.py":
-            await bot.load_extension(f"cogs.{filename[:-3]}")
 
+async def load_extensions(bot: commands.Bot):
+    for extension in cog_extensions():
+        await bot.load_extension(extension)
 
-async def main(token: str):
-    async with bot:
-        await load_extensions()
-        await bot.start(token)
+
+async def main(token: str, shard_id: int | None = None, shard_count: int | None = None):
+    bot = create_bot(shard_id, shard_count)
+    loop_watchdog.start()
+    play_log.start()
+    if shared_state.is_enabled():
+        asyncio.get_running_loop().create_task(volume_manager.sync_shared_volumes())
+    try:
+        async with bot:
+            await load_extensions(bot)
+            await bot.start(token)
+    finally:
+        # shard workers end with os._exit, so atexit handlers never run there
+        play_log.flush()
+
+
+def run_shard(token: str, shard_id: int, shard_count: int) -> None:
+    """
+    Entry point of a shard worker process. Discord routes each guild to shard
+    (guild_id >> 22) % shard_count, and DMs to shard 0.
+    """
+    shared_state.enable()
+    volume_manager.load_shared_volumes()
+    try:
+        asyncio.run(main(token, shard_id, shard_count))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_sharded(token: str, shard_count: int) -> None:
+    """
+    Start one worker process per shard and wait for them to exit.
+    Volumes are shared through the shared state store.
+    Args:
+        token: The bot token.
+        shard_count: The number of shards (and worker processes).
+    """
+    shared_state.initialize(volume_manager.all_volumes())
+    processes = [
+        multiprocessing.Process(
+            target=run_shard,
+            args=(token, shard_id, shard_count),
+            name=f"shard-{shard_id}",
+        )
+        for shard_id in range(shard_count)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {shard_count} shard workers")
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        logger.info("Stopping shard workers")
+        for process in processes:
+            process.join(SHARD_SHUTDOWN_TIMEOUT)
+            if process.is_alive():
+                logger.warning(f"{process.name} did not exit, terminating")
+                process.terminate()
+                process.join()
+    finally:
+        for process in processes:
+            if process.exitcode:
+                logger.error(f"{process.name} exited with code {process.exitcode}")
+        volume_manager.collect_shared_volumes()
 
 
 if __name__ == "__main__":
-    asyncio.run(main(TOKEN))
+    # Initialize volumes
+    volume_manager.fetch_and_initialize_volumes()
+
+    if SHARD_COUNT > 0:
+        run_sharded(TOKEN, SHARD_COUNT)
+    else:
+        asyncio.run(main(TOKEN))
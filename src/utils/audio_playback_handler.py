@@ -1,9 +1,15 @@
 import asyncio
+import ipaddress
 import logging
+import socket
+import time
+import urllib.parse
+from pathlib import Path
 
 import discord
 
-from utils import constants, volume_manager
+from utils import constants, play_log, volume_manager
+from utils.streaming_audio import StreamingPCMAudio
 
 logger = logging.getLogger(__name__)
 
@@ -27,13 +33,13 @@ def resolve_audio_name(audio_name: str) -> str | None:
     return None
 
 
-def get_audio_source(audio_name: str) -> discord.FFmpegPCMAudio | None:
+def get_audio_path(audio_name: str) -> Path | None:
     """
-    Get the audio source for the given audio name.
+    Get the file path for the given audio name.
     Args:
         audio_name: The name of the audio.
     Returns:
-        The audio source if found, else None.
+        The path of the mp3 or m4a file if found, else None.
     """
     resolved_name = resolve_audio_name(audio_name)
     if not resolved_name:
@@ -42,28 +48,70 @@ def get_audio_source(audio_name: str) -> discord.FFmpegPCMAudio | None:
     mp3_path = constants.AUDIO_DIR / f"{resolved_name}.mp3"
     m4a_path = constants.AUDIO_DIR / f"{resolved_name}.m4a"
     if mp3_path.exists():
-        return discord.FFmpegPCMAudio(str(mp3_path))
+        return mp3_path
     elif m4a_path.exists():
-        return discord.FFmpegPCMAudio(str(m4a_path))
+        return m4a_path
     else:
         logger.warning(f"Issue with {resolved_name}: no mp3 or m4a file found")
         return None
 
 
-async def play_audio(voice_client: discord.VoiceClient, audio_name: str) -> bool:
+def get_audio_source(audio_name: str) -> discord.FFmpegPCMAudio | None:
+    """
+    Get the audio source for the given audio name.
+    Args:
+        audio_name: The name of the audio.
+    Returns:
+        The audio source if found, else None.
+    """
+    audio_path = get_audio_path(audio_name)
+    if not audio_path:
+        return None
+    return discord.FFmpegPCMAudio(str(audio_path))
+
+
+async def wait_for_playback(voice_client: discord.VoiceClient) -> bool:
+    """
+    Wait for the current audio to finish, stopping it if requested.
+    Args:
+        voice_client: The Discord voice client.
+    Returns:
+        True if playback completed, False if stopped.
+    """
+    global stop_playing
+    while voice_client.is_playing():
+        await asyncio.sleep(0.5)
+        if stop_playing:
+            stop_playing = False
+            voice_client.stop()
+            logger.info("Audio stopped")
+            return False
+    return True
+
+
+async def play_audio(
+    voice_client: discord.VoiceClient,
+    audio_name: str,
+    kind: int = play_log.PLAY,
+    requested_at: float | None = None,
+) -> bool:
     """
     Play the specified audio in the given voice client.
     Args:
         voice_client: The Discord voice client.
         audio_name: The name of the audio to play.
+        kind: The kind of play to record, see play_log.
+        requested_at: time.perf_counter() when the play was requested, to record latency.
     Returns:
         True if playback completed, False if stopped or not found.
     """
-    global stop_playing
     resolved_name = resolve_audio_name(audio_name)
     if not resolved_name:
         logger.error(f"Audio not found: {audio_name}")
         return False
+    if is_streaming(voice_client):
+        logger.info(f"A stream is playing, not playing {resolved_name}")
+        return False
 
     audio_source = get_audio_source(audio_name)
     if not audio_source:
@@ -74,16 +122,118 @@ async def play_audio(voice_client: discord.VoiceClient, audio_name: str) -> bool
     volume = volume_manager.get_volume(resolved_name)
     audio_player = discord.PCMVolumeTransformer(audio_source, volume=volume)
     voice_client.play(audio_player)
-    while voice_client.is_playing():
-        await asyncio.sleep(0.5)
-        if stop_playing:
-            stop_playing = False
-            voice_client.stop()
-            logger.info("Audio stopped")
+    latency = None if requested_at is None else time.perf_counter() - requested_at
+    play_log.record(voice_client.guild.id, resolved_name, kind, latency)
+    return await wait_for_playback(voice_client)
+
+
+def is_streaming(voice_client: discord.VoiceClient) -> bool:
+    """
+    Check whether a stream is playing in the given voice client.
+    Args:
+        voice_client: The Discord voice client.
+    Returns:
+        True if the current source is a StreamingPCMAudio.
+    """
+    source = voice_client.source
+    return voice_client.is_playing() and isinstance(
+        getattr(source, "original", source), StreamingPCMAudio
+    )
+
+
+async def is_public_url(url: str) -> bool:
+    """
+    Check that a URL is http(s) and only resolves to public addresses, so
+    !stream cannot be used to reach the host's loopback, LAN or cloud metadata.
+    Args:
+        url: The URL to check.
+    Returns:
+        True if every address the host resolves to is globally routable.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return False
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            parsed.hostname, port, type=socket.SOCK_STREAM
+        )
+    except (OSError, ValueError):
+        return False
+    for *_, sockaddr in infos:
+        address = ipaddress.ip_address(sockaddr[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global:
             return False
     return True
 
 
+async def open_stream(source: str) -> discord.PCMVolumeTransformer | None:
+    """
+    Start decoding a long local audio or a remote URL, and wait until enough of
+    it is buffered to start playback.
+    Args:
+        source: The name or index of a local audio, or an http(s) URL.
+    Returns:
+        The audio player to pass to start_stream, or None if not found or failed.
+    """
+    resolved_name = resolve_audio_name(source)
+    if resolved_name:
+        audio_path = get_audio_path(resolved_name)
+        if not audio_path:
+            logger.error(f"Audio source not found for: {resolved_name}")
+            return None
+        location = str(audio_path)
+        volume = volume_manager.get_volume(resolved_name)
+    elif source.startswith(("http://", "https://")):
+        if not await is_public_url(source):
+            logger.warning(f"Refusing to stream non-public URL: {source}")
+            return None
+        location = source
+        volume = constants.DEFAULT_VOLUME
+    else:
+        logger.error(f"Audio not found: {source}")
+        return None
+
+    audio_source = StreamingPCMAudio(location)
+    if not await asyncio.to_thread(audio_source.wait_until_ready):
+        logger.error(f"Failed to buffer {source}")
+        await asyncio.to_thread(audio_source.cleanup)
+        return None
+    return discord.PCMVolumeTransformer(audio_source, volume=volume)
+
+
+async def close_stream(audio_player: discord.PCMVolumeTransformer) -> None:
+    """
+    Stop ffmpeg and the decoder of a stream that was never played. Once played,
+    the voice client cleans the stream up itself.
+    Args:
+        audio_player: The audio player returned by open_stream.
+    """
+    await asyncio.to_thread(audio_player.cleanup)
+
+
+def start_stream(
+    voice_client: discord.VoiceClient, audio_player: discord.PCMVolumeTransformer
+) -> bool:
+    """
+    Start playing a stream returned by open_stream.
+    Args:
+        voice_client: The Discord voice client.
+        audio_player: The audio player returned by open_stream.
+    Returns:
+        True if playback started. If not, the caller must close_stream the player.
+    """
+    try:
+        voice_client.play(audio_player)
+    except discord.ClientException as e:
+        logger.error(f"Failed to start stream: {e}")
+        return False
+    logger.info("Streaming started")
+    return True
+
+
 def get_stop_playing() -> bool:
     """Return the current stop_playing state."""
     return stop_playing
@@ -5,10 +5,26 @@ ROOT_DIR: Path = Path(__file__).resolve().parent.parent.parent
 AUDIO_DIR: Path = ROOT_DIR / "audios"
 VOLUMES_PATH: Path = AUDIO_DIR / "volumes.json"
 VOLUMES_RELATIVE_PATH: Path = VOLUMES_PATH.relative_to(ROOT_DIR)
+SHARED_STATE_PATH: Path = ROOT_DIR / "shared_state.db"
+PROFILES_DIR: Path = ROOT_DIR / "profiles"
+PLAY_LOG_DIR: Path = ROOT_DIR / "play_logs"
+COGS_DIR: Path = ROOT_DIR / "src" / "cogs"
 
 # === Audio Settings ===
 AUDIO_EXTENSIONS = [".mp3", ".m4a"]
 DEFAULT_VOLUME: float = 0.3
+# Seconds between shard workers picking up volumes set by other shards
+SHARED_VOLUMES_SYNC_INTERVAL: float = 10.0
+
+# === Streaming Settings ===
+# Decoded 20ms PCM frames buffered ahead of playback (250 frames = 5s, ~1MB)
+STREAM_BUFFER_FRAMES: int = 250
+# Frames decoded before playback starts
+STREAM_PREBUFFER_FRAMES: int = 25
+# Seconds to wait for the first frames before giving up
+STREAM_START_TIMEOUT: float = 15.0
+# Seconds of buffer underrun (played as silence) before a stream is stopped
+STREAM_UNDERRUN_TIMEOUT: float = 10.0
 
 # === Audio File Names and List ===
 # Note: This will read the directory at import time.
@@ -20,6 +36,35 @@ AUDIO_NAMES = sorted(
 AUDIO_NAMES_SET = set(AUDIO_NAMES)
 AUDIO_LIST = "\n".join(f"{idx + 1}. {name}" for idx, name in enumerate(AUDIO_NAMES))
 
+# === Play Log Settings ===
+# Seconds between flushes of recorded plays to disk
+PLAY_LOG_FLUSH_INTERVAL: float = 30.0
+# Size at which a play log is rotated (~90k records)
+PLAY_LOG_MAX_BYTES: int = 4 * 1024 * 1024
+# Rotated play logs kept per process
+PLAY_LOG_BACKUPS: int = 5
+
+# === Outbound Message Settings ===
+MESSAGE_CHAR_LIMIT: int = 2000
+# Seconds to wait for more messages to the same channel before sending a batch
+OUTBOUND_BATCH_WINDOW: float = 1.0
+# Messages queued per channel before new messages are dropped
+OUTBOUND_QUEUE_SIZE: int = 100
+# Fixed per-destination send budget, an approximation of Discord's per-channel
+# bucket (about 5 messages per 5 seconds), applied to DM channels too. The real
+# buckets are not exposed by discord.py, whose own limiter still handles 429s.
+OUTBOUND_RATE_LIMIT: int = 5
+OUTBOUND_RATE_PERIOD: float = 5.0
+
+# === Event Loop Watchdog Settings ===
+# Seconds between event loop heartbeats
+LOOP_HEARTBEAT_INTERVAL: float = 0.1
+# Seconds the event loop can be blocked before the blocking stack is logged
+LOOP_STALL_THRESHOLD: float = 0.25
+# Seconds between stack samples while profiling
+PROFILE_SAMPLE_INTERVAL: float = 0.005
+PROFILE_MAX_DURATION: float = 60.0
+
 # === Translation Settings ===
 # To add to this list, see emojipedia.org
 COUNTRY_FLAGS = {
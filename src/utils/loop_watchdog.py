@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Tuple
+
+from utils import constants
+
+logger = logging.getLogger(__name__)
+
+_loop_thread_id: int | None = None
+_last_tick: float = 0.0
+_lag_stats: Dict[str, float] = {"last": 0.0, "max": 0.0, "stalls": 0}
+
+
+def start() -> None:
+    """
+    Start watching the running event loop. A heartbeat task measures loop lag,
+    and a daemon thread logs the loop's stack whenever a handler blocks it for
+    longer than LOOP_STALL_THRESHOLD.
+    """
+    global _loop_thread_id, _last_tick
+    _loop_thread_id = threading.get_ident()
+    _last_tick = time.monotonic()
+    asyncio.get_running_loop().create_task(_heartbeat())
+    threading.Thread(target=_watch, name="loop-watchdog", daemon=True).start()
+    logger.info("Event loop watchdog started")
+
+
+def get_lag_stats() -> Dict[str, float]:
+    """
+    Get event loop lag statistics.
+    Returns:
+        The last and max lag in seconds, and the number of stalls logged.
+    """
+    return dict(_lag_stats)
+
+
+async def _heartbeat() -> None:
+    """Wake up every LOOP_HEARTBEAT_INTERVAL and record how late the wake-up was."""
+    global _last_tick
+    while True:
+        expected = time.monotonic() + constants.LOOP_HEARTBEAT_INTERVAL
+        await asyncio.sleep(constants.LOOP_HEARTBEAT_INTERVAL)
+        _last_tick = time.monotonic()
+        lag = max(0.0, _last_tick - expected)
+        _lag_stats["last"] = lag
+        _lag_stats["max"] = max(_lag_stats["max"], lag)
+
+
+def _loop_frame() -> FrameType | None:
+    """Return the frame the event loop thread is currently executing."""
+    if _loop_thread_id is None:
+        return None
+    return sys._current_frames().get(_loop_thread_id)
+
+
+def _attribute(frame: FrameType | None) -> str:
+    """
+    Find the cog command or listener a stack belongs to.
+    Args:
+        frame: The innermost frame of the stack.
+    Returns:
+        The outermost cog function, e.g. "General.on_raw_reaction_add", or "unknown".
+    """
+    cogs_dir = str(constants.COGS_DIR)
+    handler = "unknown"
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(cogs_dir):
+            handler = frame.f_code.co_qualname
+        frame = frame.f_back
+    return handler
+
+
+def _watch() -> None:
+    """Log the event loop's stack once per stall, from the watchdog thread."""
+    reported_tick = None
+    while True:
+        time.sleep(constants.LOOP_HEARTBEAT_INTERVAL)
+        tick = _last_tick
+        blocked_for = time.monotonic() - tick - constants.LOOP_HEARTBEAT_INTERVAL
+        if blocked_for < constants.LOOP_STALL_THRESHOLD or tick == reported_tick:
+            continue
+        reported_tick = tick
+        frame = _loop_frame()
+        if frame is None:
+            continue
+        _lag_stats["stalls"] += 1
+        logger.warning(
+            f"Event loop blocked for {blocked_for:.2f}s in {_attribute(frame)}:\n"
+            + "".join(traceback.format_stack(frame))
+        )
+
+
+def _fold(frame: FrameType) -> str:
+    """
+    Format a stack as one line of a folded (flame graph) profile.
+    Args:
+        frame: The innermost frame of the stack.
+    Returns:
+        The stack from outermost to innermost, separated by ';'.
+    """
+    names = []
+    while frame is not None:
+        names.append(f"{Path(frame.f_code.co_filename).stem}:{frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _sample(duration: float) -> Path:
+    """
+    Sample the event loop's stack for a duration and write a folded profile.
+    Args:
+        duration: The number of seconds to sample for.
+    Returns:
+        The path of the written profile.
+    """
+    samples: Counter[str] = Counter()
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        frame = _loop_frame()
+        if frame is not None:
+            samples[_fold(frame)] += 1
+        time.sleep(constants.PROFILE_SAMPLE_INTERVAL)
+
+    constants.PROFILES_DIR.mkdir(exist_ok=True)
+    path = constants.PROFILES_DIR / f"loop-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+    logger.info(f"Wrote {sum(samples.values())} samples to {path}")
+    return path
+
+
+async def profile(duration: float) -> Tuple[Path, float]:
+    """
+    Sample the event loop from a background thread without blocking it.
+    Args:
+        duration: The number of seconds to sample for, capped at PROFILE_MAX_DURATION.
+    Returns:
+        The path of the written profile and the number of seconds sampled.
+    """
+    duration = max(0.0, min(constants.PROFILE_MAX_DURATION, duration))
+    return await asyncio.to_thread(_sample, duration), duration
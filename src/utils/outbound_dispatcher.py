@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Tuple
+
+import discord
+
+from utils import constants
+
+logger = logging.getLogger(__name__)
+
+# (content, message to reply to)
+OutboundMessage = Tuple[str, discord.Message | None]
+
+METRIC_NAMES = (
+    "queued",
+    "sent",
+    "merged",
+    "failed",
+    "dropped",
+    "rate_limited",
+    "max_depth",
+)
+
+_queues: Dict[int, asyncio.Queue[OutboundMessage]] = {}
+_workers: Dict[int, asyncio.Task] = {}
+_send_times: Dict[int, Deque[float]] = defaultdict(deque)
+_metrics: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(METRIC_NAMES, 0))
+
+
+def enqueue(
+    destination: discord.abc.Messageable,
+    content: str,
+    reference: discord.Message | None = None,
+) -> bool:
+    """
+    Queue a message to be sent to a channel or user. Messages to the same
+    destination that arrive within OUTBOUND_BATCH_WINDOW are merged into one.
+    Args:
+        destination: Anything with an id and an async send(), e.g. a channel or user.
+        content: The message content.
+        reference: Optional message to reply to.
+    Returns:
+        True if queued, False if the destination's queue is full and the message was dropped.
+    """
+    key = destination.id
+    metrics = _metrics[key]
+    queue = _queues.get(key)
+    if queue is None:
+        queue = _queues[key] = asyncio.Queue(maxsize=constants.OUTBOUND_QUEUE_SIZE)
+
+    try:
+        queue.put_nowait((content, reference))
+    except asyncio.QueueFull:
+        metrics["dropped"] += 1
+        logger.warning(f"Outbound queue for {key} is full, dropping message")
+        return False
+    metrics["queued"] += 1
+    metrics["max_depth"] = max(metrics["max_depth"], queue.qsize())
+
+    if key not in _workers:
+        _workers[key] = asyncio.create_task(_run(key, destination, queue))
+    return True
+
+
+def get_metrics() -> Dict[int, Dict[str, int]]:
+    """
+    Get backpressure metrics per destination id.
+    Returns:
+        A dictionary of destination ids to counters, including the current queue depth.
+    """
+    return {
+        key: {**metrics, "depth": _queues[key].qsize() if key in _queues else 0}
+        for key, metrics in _metrics.items()
+    }
+
+
+def _same_reference(a: discord.Message | None, b: discord.Message | None) -> bool:
+    """Return whether two queued messages reply to the same message (or both to none)."""
+    return (a.id if a else None) == (b.id if b else None)
+
+
+def _split(content: str) -> List[str]:
+    """
+    Split content into chunks Discord accepts, preferring to break at newlines.
+    Args:
+        content: The message content.
+    Returns:
+        Chunks of at most MESSAGE_CHAR_LIMIT characters.
+    """
+    chunks = []
+    while len(content) > constants.MESSAGE_CHAR_LIMIT:
+        cut = content.rfind("\n", 0, constants.MESSAGE_CHAR_LIMIT + 1)
+        if cut <= 0:
+            cut = constants.MESSAGE_CHAR_LIMIT
+        chunks.append(content[:cut])
+        content = content[cut:].removeprefix("\n")
+    chunks.append(content)
+    return chunks
+
+
+async def _wait_for_rate_limit(key: int) -> None:
+    """
+    Sleep until another message fits the destination's fixed send budget
+    (OUTBOUND_RATE_LIMIT per OUTBOUND_RATE_PERIOD). This only spreads bursts
+    out; discord.py still tracks the real buckets and retries on 429.
+    Args:
+        key: The destination id.
+    """
+    send_times = _send_times[key]
+    now = time.monotonic()
+    while send_times and now - send_times[0] >= constants.OUTBOUND_RATE_PERIOD:
+        send_times.popleft()
+    if len(send_times) >= constants.OUTBOUND_RATE_LIMIT:
+        _metrics[key]["rate_limited"] += 1
+        await asyncio.sleep(send_times[0] + constants.OUTBOUND_RATE_PERIOD - now)
+        send_times.popleft()
+    send_times.append(time.monotonic())
+
+
+async def _run(
+    key: int,
+    destination: discord.abc.Messageable,
+    queue: asyncio.Queue[OutboundMessage],
+) -> None:
+    """
+    Send the queued messages of one destination, then exit once the queue is empty.
+    Args:
+        key: The destination id.
+        destination: The channel or user to send to.
+        queue: The destination's queue.
+    """
+    metrics = _metrics[key]
+    pending: OutboundMessage | None = None
+    while True:
+        if pending is None:
+            if queue.empty():
+                del _queues[key]
+                del _workers[key]
+                return
+            pending = queue.get_nowait()
+            # give bursts a chance to arrive so they can be merged
+            await asyncio.sleep(constants.OUTBOUND_BATCH_WINDOW)
+
+        content, reference = pending
+        pending = None
+        merged = 0
+        while not queue.empty():
+            next_content, next_reference = queue.get_nowait()
+            if (
+                not _same_reference(reference, next_reference)
+                or len(content) + 1 + len(next_content) > constants.MESSAGE_CHAR_LIMIT
+            ):
+                pending = (next_content, next_reference)
+                break
+            content += "\n" + next_content
+            merged += 1
+
+        metrics["merged"] += merged
+        for chunk in _split(content):
+            await _wait_for_rate_limit(key)
+            try:
+                await destination.send(chunk, reference=reference)
+            except Exception as e:
+                metrics["failed"] += 1
+                logger.error(f"Failed to send to {key}: {e}")
+            else:
+                metrics["sent"] += 1
+            # only the first chunk is a reply
+            reference = None
@@ -0,0 +1,204 @@
+import asyncio
+import itertools
+import logging
+import math
+import multiprocessing
+import statistics
+import struct
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from utils import constants
+
+logger = logging.getLogger(__name__)
+
+# Play kinds
+PLAY = 0
+REPLAY = 1
+GREETING = 2
+
+NAME_SIZE = 24
+# timestamp, guild id, audio name, kind, latency in seconds (NaN if unknown)
+RECORD = struct.Struct(f"<dQ{NAME_SIZE}sBf")
+
+_pending: List[bytes] = []
+_flush_task: asyncio.Task | None = None
+# The flush task and !stats both write from worker threads
+_write_lock = threading.Lock()
+
+
+def record(
+    guild_id: int, audio_name: str, kind: int, latency: float | None = None
+) -> None:
+    """
+    Record a play. Records are buffered in memory and written by the flush task.
+    Args:
+        guild_id: The ID of the guild the audio was played in.
+        audio_name: The name of the audio.
+        kind: PLAY, REPLAY or GREETING.
+        latency: Seconds from the command (or event) to the start of playback.
+    """
+    _pending.append(
+        RECORD.pack(
+            time.time(),
+            guild_id,
+            audio_name.encode("utf-8")[:NAME_SIZE],
+            kind,
+            math.nan if latency is None else latency,
+        )
+    )
+
+
+def start() -> None:
+    """Start the background task that flushes recorded plays to disk."""
+    global _flush_task
+    if _flush_task is None:
+        _flush_task = asyncio.get_running_loop().create_task(_flush_periodically())
+
+
+def _log_path() -> Path:
+    """Return this process's active play log, so shard workers never share a file."""
+    return constants.PLAY_LOG_DIR / f"{multiprocessing.current_process().name}.bin"
+
+
+def _rotate(path: Path) -> None:
+    """
+    Move the active play log aside and delete the oldest rotated logs.
+    Args:
+        path: The active play log.
+    """
+    path.rename(path.with_name(f"{path.stem}.{time.time_ns()}.bin"))
+    rotated = sorted(path.parent.glob(f"{path.stem}.*.bin"))
+    for old_path in rotated[: -constants.PLAY_LOG_BACKUPS]:
+        old_path.unlink()
+
+
+def _take_pending() -> List[bytes]:
+    """Return and clear the buffered records."""
+    batch = _pending[:]
+    _pending.clear()
+    return batch
+
+
+def _write(batch: List[bytes]) -> None:
+    """
+    Append records to this process's play log, rotating it when full.
+    Args:
+        batch: The packed records.
+    """
+    if not batch:
+        return
+    data = b"".join(batch)
+    path = _log_path()
+    with _write_lock:
+        path.parent.mkdir(exist_ok=True)
+        if (
+            path.exists()
+            and path.stat().st_size + len(data) > constants.PLAY_LOG_MAX_BYTES
+        ):
+            _rotate(path)
+        with open(path, "ab") as f:
+            f.write(data)
+
+
+def flush() -> None:
+    """Write all buffered records to disk. Call on shutdown."""
+    try:
+        _write(_take_pending())
+    except OSError as e:
+        logger.error(f"Failed to write play log: {e}")
+
+
+async def _flush_periodically() -> None:
+    """Write buffered records every PLAY_LOG_FLUSH_INTERVAL without blocking the loop."""
+    while True:
+        await asyncio.sleep(constants.PLAY_LOG_FLUSH_INTERVAL)
+        if not _pending:
+            continue
+        try:
+            await asyncio.to_thread(_write, _take_pending())
+        except OSError as e:
+            logger.error(f"Failed to write play log: {e}")
+
+
+def _read_logs() -> Iterator[bytes]:
+    """
+    Read every shard's active and rotated play logs, one at a time.
+    Returns:
+        The whole records of each log.
+    """
+    for path in sorted(constants.PLAY_LOG_DIR.glob("*.bin")):
+        try:
+            data = path.read_bytes()
+        except OSError as e:
+            # rotated away by another shard since the glob, or unreadable
+            logger.warning(f"Skipping play log {path.name}: {e}")
+            continue
+        # ignore a partially written trailing record
+        yield data[: len(data) - len(data) % RECORD.size]
+
+
+def _aggregate(batch: List[bytes], guild_id: int | None, top: int) -> Dict:
+    """
+    Write the buffered records, then aggregate every play log in a single pass.
+    This unpacks every record of every shard's active and rotated logs in
+    Python, so it is O(records) up to PLAY_LOG_MAX_BYTES * (PLAY_LOG_BACKUPS + 1)
+    per shard. If the records cannot be written they are still counted.
+    Args:
+        batch: The buffered records to write first.
+        guild_id: Only count plays in this guild, or None for all guilds.
+        top: The number of most played audios to return.
+    Returns:
+        The number of plays, the top audios with their counts, and the
+        p50/p90/p99 latencies in seconds (None if too few latencies are known).
+    """
+    unwritten = b""
+    try:
+        _write(batch)
+    except OSError as e:
+        logger.error(f"Failed to write play log: {e}")
+        # count them now, and keep them for the next flush
+        unwritten = b"".join(batch)
+        _pending[:0] = batch
+
+    counts: Counter[bytes] = Counter()
+    latencies: List[float] = []
+    for data in itertools.chain([unwritten], _read_logs()):
+        for _, record_guild_id, name, _, latency in RECORD.iter_unpack(data):
+            if guild_id is not None and record_guild_id != guild_id:
+                continue
+            counts[name] += 1
+            if not math.isnan(latency):
+                latencies.append(latency)
+
+    percentiles = None
+    if len(latencies) >= 2:
+        quantiles = statistics.quantiles(latencies, n=100)
+        percentiles = {
+            "p50": quantiles[49],
+            "p90": quantiles[89],
+            "p99": quantiles[98],
+        }
+    return {
+        "plays": counts.total(),
+        "top": [
+            (name.rstrip(b"\0").decode("utf-8", "replace"), count)
+            for name, count in counts.most_common(top)
+        ],
+        "latency": percentiles,
+    }
+
+
+async def get_stats(guild_id: int | None = None, top: int = 10) -> Dict:
+    """
+    Aggregate play statistics in a background thread.
+    Args:
+        guild_id: Only count plays in this guild, or None for all guilds.
+        top: The number of most played audios to return.
+    Returns:
+        See _aggregate.
+    """
+    return await asyncio.to_thread(_aggregate, _take_pending(), guild_id, top)
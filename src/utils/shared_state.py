@@ -0,0 +1,95 @@
+import logging
+import sqlite3
+import threading
+from typing import Dict
+
+from utils import constants
+
+logger = logging.getLogger(__name__)
+
+# SQLite connections cannot be shared across threads, so each thread opens its own
+_local = threading.local()
+_enabled: bool = False
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Open (or reuse) this thread's connection to the shared state database.
+    Returns:
+        The SQLite connection.
+    """
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        connection = sqlite3.connect(
+            constants.SHARED_STATE_PATH, timeout=5, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS volumes (audio_name TEXT PRIMARY KEY, volume REAL NOT NULL)"
+        )
+        _local.connection = connection
+    return connection
+
+
+def close() -> None:
+    """
+    Close this thread's connection. Must be called before forking shard workers,
+    SQLite connections cannot be shared across processes.
+    """
+    connection = getattr(_local, "connection", None)
+    if connection is not None:
+        connection.close()
+        _local.connection = None
+
+
+def initialize(volumes: Dict[str, float]) -> None:
+    """
+    Seed the shared store with the volumes loaded by the parent process.
+    Args:
+        volumes: A dictionary of audio names to volumes.
+    """
+    connection = _connect()
+    with connection:
+        connection.execute("DELETE FROM volumes")
+        connection.executemany(
+            "INSERT INTO volumes (audio_name, volume) VALUES (?, ?)", volumes.items()
+        )
+    close()
+    logger.info(f"Shared state initialized at {constants.SHARED_STATE_PATH}")
+
+
+def enable() -> None:
+    """Share volumes through the shared store (shard workers)."""
+    global _enabled
+    _enabled = True
+
+
+def is_enabled() -> bool:
+    """Return whether this process uses the shared store."""
+    return _enabled
+
+
+def set_volume(audio_name: str, value: float) -> None:
+    """
+    Store the volume for a given audio. Blocking, run it off the event loop.
+    Args:
+        audio_name: The name of the audio.
+        value: The volume value.
+    """
+    try:
+        _connect().execute(
+            "INSERT INTO volumes (audio_name, volume) VALUES (?, ?) "
+            "ON CONFLICT (audio_name) DO UPDATE SET volume = excluded.volume",
+            (audio_name, value),
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Failed to store volume for {audio_name}: {e}")
+
+
+def all_volumes() -> Dict[str, float]:
+    """
+    Get all stored volumes. Blocking, run it off the event loop.
+    Returns:
+        A dictionary of audio names to volumes.
+    """
+    return dict(_connect().execute("SELECT audio_name, volume FROM volumes"))
@@ -0,0 +1,145 @@
+import logging
+import queue
+import subprocess
+import threading
+
+import discord
+
+from utils import constants
+
+logger = logging.getLogger(__name__)
+
+FRAME_SIZE = discord.opus.Encoder.FRAME_SIZE  # 20ms of 48kHz stereo s16le PCM
+FRAME_DURATION = discord.opus.Encoder.FRAME_LENGTH / 1000
+SILENCE = b"\x00" * FRAME_SIZE
+# Only let ffmpeg open HTTP(S) for URLs, not files, pipes or other protocols a
+# playlist could point it to, and resume dropped connections instead of ending
+REMOTE_OPTIONS = [
+    "-protocol_whitelist",
+    "http,https,tcp,tls",
+    "-reconnect",
+    "1",
+    "-reconnect_streamed",
+    "1",
+    "-reconnect_delay_max",
+    "5",
+]
+
+
+class StreamingPCMAudio(discord.AudioSource):
+    """
+    Audio source that decodes a local file or URL with ffmpeg in a background
+    thread into a bounded buffer of PCM frames. Memory stays flat regardless of
+    track length, and playback can start once the first frames are decoded.
+    """
+
+    def __init__(self, source: str):
+        args = ["ffmpeg", "-hide_banner", "-loglevel", "warning"]
+        if source.startswith(("http://", "https://")):
+            args += REMOTE_OPTIONS
+        args += ["-i", source, "-f", "s16le", "-ar", "48000", "-ac", "2", "pipe:1"]
+
+        self._source = source
+        self._frames: queue.Queue[bytes] = queue.Queue(
+            maxsize=constants.STREAM_BUFFER_FRAMES
+        )
+        self._ready = threading.Event()
+        self._closed = threading.Event()
+        self._finished = False
+        self._failed = False
+        self._underrun_frames = 0
+        self._process = subprocess.Popen(
+            args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE
+        )
+        self._decoder = threading.Thread(
+            target=self._decode, name="stream-decoder", daemon=True
+        )
+        self._decoder.start()
+
+    def _put(self, frame: bytes) -> bool:
+        """
+        Add a frame to the buffer, waiting while it is full.
+        Args:
+            frame: The PCM frame, or b"" to mark the end of the stream.
+        Returns:
+            False if the source was closed while waiting.
+        """
+        while not self._closed.is_set():
+            try:
+                self._frames.put(frame, timeout=0.1)
+            except queue.Full:
+                continue
+            if self._frames.qsize() >= constants.STREAM_PREBUFFER_FRAMES or not frame:
+                self._ready.set()
+            return True
+        return False
+
+    def _decode(self) -> None:
+        """Read frames from ffmpeg into the buffer until the stream ends or is closed."""
+        stdout = self._process.stdout
+        assert stdout is not None
+        decoded = 0
+        try:
+            while True:
+                frame = stdout.read(FRAME_SIZE)
+                if not frame:
+                    break
+                # pad the last partial frame
+                if not self._put(frame.ljust(FRAME_SIZE, b"\x00")):
+                    return
+                decoded += 1
+        except (OSError, ValueError) as e:
+            if not self._closed.is_set():
+                logger.error(f"Failed to decode {self._source}: {e}")
+        returncode = self._process.wait()
+        if not self._closed.is_set() and (returncode or not decoded):
+            # e.g. a bad URL or a 404, set before the end marker wakes wait_until_ready
+            logger.error(f"ffmpeg failed on {self._source} with code {returncode}")
+            self._failed = True
+        self._put(b"")
+
+    def wait_until_ready(self, timeout: float = constants.STREAM_START_TIMEOUT) -> bool:
+        """
+        Block until enough frames are buffered to start playback.
+        Args:
+            timeout: The number of seconds to wait.
+        Returns:
+            True if playback can start, False on timeout or if ffmpeg failed
+            before decoding anything.
+        """
+        return self._ready.wait(timeout) and not self._failed
+
+    def read(self) -> bytes:
+        """
+        Return the next 20ms frame. Called from the voice player thread.
+        Returns:
+            The frame, silence while the buffer is empty, or b"" once the stream has ended.
+        """
+        if self._finished:
+            return b""
+        try:
+            frame = self._frames.get(timeout=FRAME_DURATION)
+        except queue.Empty:
+            # play silence instead of stalling so the player keeps its timing
+            self._underrun_frames += 1
+            if self._underrun_frames * FRAME_DURATION >= constants.STREAM_UNDERRUN_TIMEOUT:
+                logger.warning(f"Stream {self._source} stalled, stopping")
+                self._finished = True
+                return b""
+            return SILENCE
+        self._underrun_frames = 0
+        if not frame:
+            self._finished = True
+        return frame
+
+    def is_opus(self) -> bool:
+        return False
+
+    def cleanup(self) -> None:
+        """Stop ffmpeg and the decoder thread."""
+        self._closed.set()
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._decoder.join(timeout=1)
+        logger.info(f"Stream {self._source} closed")
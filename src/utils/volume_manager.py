@@ -1,16 +1,21 @@
+import asyncio
 import atexit
 import json
 import logging
 import subprocess
+import time
 from collections import defaultdict
 from typing import Dict
 
-from utils import constants
+from utils import constants, shared_state
 
 logger = logging.getLogger(__name__)
 
 _volumes: Dict[str, float] = defaultdict(lambda: constants.DEFAULT_VOLUME)
 _volumes_changed: bool = False
+# Shard workers: shared store writes not yet finished, and when each audio's last one finished
+_pending_writes: Dict[str, asyncio.Future] = {}
+_written_at: Dict[str, float] = {}
 
 
 def fetch_and_initialize_volumes() -> None:
@@ -70,6 +75,14 @@ def set_volume(audio_name: str, value: float) -> None:
         return
     value = max(0.0, min(1.0, value))
     _volumes[audio_name] = value
+    if shared_state.is_enabled():
+        # The parent process collects shared volumes and saves them on exit
+        future = asyncio.get_running_loop().run_in_executor(
+            None, shared_state.set_volume, audio_name, value
+        )
+        _pending_writes[audio_name] = future
+        future.add_done_callback(lambda f: _finish_shared_write(audio_name, f))
+        return
     set_volumes_changed()
 
 
@@ -82,6 +95,63 @@ def all_volumes() -> Dict[str, float]:
     return dict(_volumes)
 
 
+def load_shared_volumes() -> None:
+    """
+    Replace the in-memory volumes with the shared ones (shard workers).
+    """
+    volumes = shared_state.all_volumes()
+    _volumes.clear()
+    _volumes.update(volumes)
+
+
+def _finish_shared_write(audio_name: str, future: asyncio.Future) -> None:
+    """
+    Record that a shared store write finished, logging it if it failed.
+    Args:
+        audio_name: The name of the audio.
+        future: The finished write.
+    """
+    if _pending_writes.get(audio_name) is future:
+        del _pending_writes[audio_name]
+    _written_at[audio_name] = time.monotonic()
+    if not future.cancelled() and future.exception():
+        logger.error(f"Failed to share volume for {audio_name}: {future.exception()}")
+
+
+async def sync_shared_volumes() -> None:
+    """
+    Periodically pick up volumes set by other shard workers, off the event loop.
+    """
+    while True:
+        await asyncio.sleep(constants.SHARED_VOLUMES_SYNC_INTERVAL)
+        started = time.monotonic()
+        try:
+            volumes = await asyncio.to_thread(shared_state.all_volumes)
+        except Exception as e:
+            logger.error(f"Failed to sync shared volumes: {e}")
+            continue
+        for audio_name, volume in volumes.items():
+            # the read may predate this shard's own latest write
+            if (
+                audio_name in _pending_writes
+                or _written_at.get(audio_name, started) > started
+            ):
+                continue
+            _volumes[audio_name] = volume
+
+
+def collect_shared_volumes() -> None:
+    """
+    Load the volumes set by shard workers back into memory so they get saved on exit.
+    """
+    volumes = shared_state.all_volumes()
+    shared_state.close()
+    if volumes != dict(_volumes):
+        _volumes.clear()
+        _volumes.update(volumes)
+        set_volumes_changed()
+
+
 def set_volumes_changed() -> None:
     """
     Mark that the volumes have changed and need to be saved.
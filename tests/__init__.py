@@ -0,0 +1,24 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+from unittest import mock
+
+# The bot runs from src/ (uv run src/main.py), so its modules import as top-level packages
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+os.environ.setdefault("DISCORD_TOKEN", "test-token")
+
+TEST_CONFIG = {
+    "USER_IDS": {"fsg": 1001, "gaj": 1002},
+    "CHANNEL_IDS": {"general": 2001},
+    "SETTINGS": {"channel_name": "general"},
+}
+
+
+def import_general():
+    """Import cogs.general with TEST_CONFIG instead of the private variables.toml."""
+    with (
+        mock.patch("builtins.open", mock.mock_open(read_data=b"")),
+        mock.patch("tomllib.load", return_value=TEST_CONFIG),
+    ):
+        return importlib.import_module("cogs.general")
@@ -0,0 +1,30 @@
+import sys
+import unittest
+
+import tests  # noqa: F401
+import main
+
+
+class RequiredIntentsTest(unittest.TestCase):
+    def test_cog_intents_are_read_without_importing_cogs(self):
+        cogs = [name for name in sys.modules if name.startswith("cogs.")]
+        for name in cogs:
+            del sys.modules[name]
+
+        intents = main.required_intents()
+
+        self.assertFalse([name for name in sys.modules if name.startswith("cogs.")])
+        self.assertTrue(intents.message_content)
+        self.assertTrue(intents.voice_states)
+        self.assertTrue(intents.guild_reactions)
+        self.assertFalse(intents.presences)
+        self.assertFalse(intents.members)
+        self.assertFalse(intents.typing)
+
+    def test_every_cog_declares_intents(self):
+        for extension in main.cog_extensions():
+            self.assertIsNotNone(main.declared_intents(extension), extension)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import tests  # noqa: F401
+from utils import constants, outbound_dispatcher
+
+
+class StubDestination:
+    """Stands in for a channel or user, recording what would be sent over HTTP."""
+
+    def __init__(self, id: int):
+        self.id = id
+        self.sent = []
+
+    async def send(self, content, reference=None):
+        self.sent.append((time.monotonic(), content, reference))
+
+
+class StubMessage:
+    def __init__(self, id: int):
+        self.id = id
+
+
+class OutboundDispatcherTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(constants, "OUTBOUND_BATCH_WINDOW", 0.01),
+            mock.patch.object(constants, "OUTBOUND_RATE_LIMIT", 2),
+            mock.patch.object(constants, "OUTBOUND_RATE_PERIOD", 0.2),
+            mock.patch.object(constants, "OUTBOUND_QUEUE_SIZE", 5),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(outbound_dispatcher._metrics.clear)
+        self.addCleanup(outbound_dispatcher._send_times.clear)
+
+    async def drain(self):
+        while outbound_dispatcher._workers:
+            await asyncio.sleep(0.01)
+
+    async def test_burst_is_merged(self):
+        destination = StubDestination(1)
+        for idx in range(3):
+            outbound_dispatcher.enqueue(destination, f"msg{idx}")
+        await self.drain()
+
+        self.assertEqual([content for _, content, _ in destination.sent], ["msg0\nmsg1\nmsg2"])
+        metrics = outbound_dispatcher.get_metrics()[1]
+        self.assertEqual((metrics["sent"], metrics["merged"]), (1, 2))
+
+    async def test_replies_to_different_messages_are_not_merged(self):
+        destination = StubDestination(2)
+        first, second = StubMessage(10), StubMessage(11)
+        outbound_dispatcher.enqueue(destination, "a", reference=first)
+        outbound_dispatcher.enqueue(destination, "b", reference=first)
+        outbound_dispatcher.enqueue(destination, "c", reference=second)
+        await self.drain()
+
+        self.assertEqual(
+            [(content, reference) for _, content, reference in destination.sent],
+            [("a\nb", first), ("c", second)],
+        )
+
+    async def test_oversized_message_is_split(self):
+        destination = StubDestination(3)
+        reference = StubMessage(12)
+        outbound_dispatcher.enqueue(destination, "x" * 2500, reference=reference)
+        await self.drain()
+
+        self.assertEqual(
+            [(len(content), ref) for _, content, ref in destination.sent],
+            [(constants.MESSAGE_CHAR_LIMIT, reference), (500, None)],
+        )
+
+    async def test_sends_are_paced_to_the_rate_budget(self):
+        destination = StubDestination(4)
+        outbound_dispatcher.enqueue(destination, "x" * 5000)
+        await self.drain()
+
+        times = [sent_at for sent_at, _, _ in destination.sent]
+        self.assertEqual(len(times), 3)
+        self.assertGreaterEqual(times[2] - times[0], constants.OUTBOUND_RATE_PERIOD * 0.9)
+        self.assertEqual(outbound_dispatcher.get_metrics()[4]["rate_limited"], 1)
+
+    async def test_full_queue_drops(self):
+        destination = StubDestination(5)
+        results = [outbound_dispatcher.enqueue(destination, str(idx)) for idx in range(7)]
+        await self.drain()
+
+        self.assertEqual(results.count(False), 2)
+        self.assertEqual(outbound_dispatcher.get_metrics()[5]["dropped"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
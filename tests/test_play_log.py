@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import tests  # noqa: F401
+from utils import constants, play_log
+
+
+class PlayLogTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        patcher = mock.patch.object(
+            constants, "PLAY_LOG_DIR", Path(log_dir.name) / "play_logs"
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        play_log._pending.clear()
+        self.addCleanup(play_log._pending.clear)
+
+    async def test_stats_count_plays_across_logs(self):
+        play_log.record(1, "nihao", play_log.PLAY, 0.2)
+        play_log.record(1, "nihao", play_log.GREETING)
+        play_log.record(2, "other", play_log.REPLAY, 0.4)
+
+        stats = await play_log.get_stats(1)
+        self.assertEqual(stats["plays"], 2)
+        self.assertEqual(stats["top"], [("nihao", 2)])
+        self.assertIsNone(stats["latency"])
+
+        play_log.record(2, "other", play_log.PLAY, 0.6)
+        stats = await play_log.get_stats()
+        self.assertEqual(stats["plays"], 4)
+        self.assertAlmostEqual(stats["latency"]["p50"], 0.4, places=5)
+
+    async def test_failed_write_keeps_records(self):
+        play_log.record(1, "nihao", play_log.PLAY)
+        play_log.record(1, "nihao", play_log.PLAY)
+
+        with mock.patch.object(play_log, "_write", side_effect=OSError("disk full")):
+            stats = await play_log.get_stats(1)
+        self.assertEqual(stats["plays"], 2)
+        self.assertEqual(len(play_log._pending), 2)
+
+        # written on the next call, and not counted twice
+        stats = await play_log.get_stats(1)
+        self.assertEqual(stats["plays"], 2)
+        self.assertFalse(play_log._pending)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import discord
+
+from tests import TEST_CONFIG, import_general
+
+general = import_general()
+import main  # noqa: E402
+from utils import constants, shared_state, volume_manager  # noqa: E402
+
+SHARD_COUNT = 3
+
+
+class FakeGateway:
+    """Routes dispatches to shard bots the way Discord's gateway does."""
+
+    def __init__(self, bots):
+        self.bots = bots
+
+    def shard_for(self, guild_id: int | None) -> int:
+        # DMs are only sent to shard 0
+        return 0 if guild_id is None else (guild_id >> 22) % len(self.bots)
+
+    def guild_create(self, guild_id: int, channel_id: int) -> None:
+        self.bots[self.shard_for(guild_id)]._connection.parse_guild_create(
+            {
+                "id": str(guild_id),
+                "name": f"guild-{guild_id}",
+                "channels": [
+                    {"id": str(channel_id), "type": 0, "name": "general", "position": 0}
+                ],
+                "roles": [],
+                "member_count": 1,
+                "unavailable": False,
+            }
+        )
+
+
+class ShardRoutingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_each_guild_is_cached_by_its_shard_only(self):
+        bots = [main.create_bot(shard_id, SHARD_COUNT) for shard_id in range(SHARD_COUNT)]
+        gateway = FakeGateway(bots)
+        guild_ids = [(timestamp << 22) | 1 for timestamp in range(1000, 1030)]
+        for idx, guild_id in enumerate(guild_ids):
+            gateway.guild_create(guild_id, 5000 + idx)
+        await asyncio.sleep(0)
+
+        for guild_id in guild_ids:
+            owners = [bot for bot in bots if bot.get_guild(guild_id) is not None]
+            self.assertEqual(len(owners), 1)
+            self.assertEqual(owners[0].shard_id, owners[0].get_guild(guild_id).shard_id)
+        self.assertEqual(sorted(len(bot.guilds) for bot in bots), [10, 10, 10])
+        for bot in bots:
+            await bot.close()
+
+    async def test_send_fetches_channel_owned_by_another_shard(self):
+        channel = mock.MagicMock(spec=discord.TextChannel)
+        channel.send = mock.AsyncMock()
+        bot = mock.MagicMock()
+        bot.get_channel.return_value = None
+        bot.fetch_channel = mock.AsyncMock(return_value=channel)
+
+        await general.General.send.callback(general.General(bot), mock.MagicMock(), msg="hi")
+
+        bot.fetch_channel.assert_awaited_once_with(TEST_CONFIG["CHANNEL_IDS"]["general"])
+        channel.send.assert_awaited_once_with("hi")
+
+
+class SharedVolumesTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patches = [
+            mock.patch.object(constants, "SHARED_STATE_PATH", Path(self.tmp.name) / "state.db"),
+            mock.patch.object(constants, "SHARED_VOLUMES_SYNC_INTERVAL", 0.01),
+            mock.patch.object(shared_state, "_enabled", True),
+            mock.patch.object(volume_manager, "_volumes_changed", False),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(shared_state.close)
+        self.audio = constants.AUDIO_NAMES[0]
+        shared_state.initialize({self.audio: 0.8})
+        volume_manager.load_shared_volumes()
+
+    async def test_sync_does_not_revert_local_write(self):
+        set_volume = shared_state.set_volume
+
+        def slow_set_volume(audio_name, value):
+            time.sleep(0.05)
+            set_volume(audio_name, value)
+
+        sync = asyncio.create_task(volume_manager.sync_shared_volumes())
+        with mock.patch.object(shared_state, "set_volume", slow_set_volume):
+            for value in (0.1, 0.2, 0.3):
+                volume_manager.set_volume(self.audio, value)
+                for _ in range(10):
+                    await asyncio.sleep(0.01)
+                    self.assertEqual(volume_manager.get_volume(self.audio), value)
+        sync.cancel()
+
+    async def test_sync_picks_up_other_shards_writes(self):
+        sync = asyncio.create_task(volume_manager.sync_shared_volumes())
+        await asyncio.to_thread(shared_state.set_volume, self.audio, 0.9)
+        await asyncio.sleep(0.05)
+        self.assertEqual(volume_manager.get_volume(self.audio), 0.9)
+        sync.cancel()
+
+
+if __name__ == "__main__":
+    unittest.main()
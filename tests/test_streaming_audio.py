@@ -0,0 +1,132 @@
+import http.server
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import wave
+from pathlib import Path
+from unittest import mock
+
+import tests  # noqa: F401
+from utils import audio_playback_handler
+from utils.streaming_audio import FRAME_SIZE, StreamingPCMAudio
+
+
+def read_all(audio_source: StreamingPCMAudio) -> list[bytes]:
+    """Read frames like the voice player does, until the end of the stream."""
+    frames = []
+    while frame := audio_source.read():
+        frames.append(frame)
+    return frames
+
+
+class PublicUrlTest(unittest.IsolatedAsyncioTestCase):
+    async def test_private_and_non_http_urls_are_rejected(self):
+        for url in (
+            "http://127.0.0.1/track.mp3",
+            "http://localhost:8080/track.mp3",
+            "http://10.0.0.5/track.mp3",
+            "http://169.254.169.254/latest/meta-data/",
+            "http://[::1]/track.mp3",
+            "http://[::ffff:192.168.1.1]/track.mp3",
+            "http://0.0.0.0/track.mp3",
+            "file:///etc/passwd",
+            "ftp://93.184.215.14/track.mp3",
+            "http:///track.mp3",
+        ):
+            with self.subTest(url=url):
+                self.assertFalse(await audio_playback_handler.is_public_url(url))
+
+    async def test_public_address_is_allowed(self):
+        self.assertTrue(
+            await audio_playback_handler.is_public_url("https://93.184.215.14/a.mp3")
+        )
+
+    async def test_open_stream_refuses_private_url_without_starting_ffmpeg(self):
+        with mock.patch("utils.audio_playback_handler.StreamingPCMAudio") as stream:
+            audio_player = await audio_playback_handler.open_stream(
+                "http://127.0.0.1:8000/track.mp3"
+            )
+        self.assertIsNone(audio_player)
+        stream.assert_not_called()
+
+
+@unittest.skipUnless(os.name == "posix", "fake ffmpeg is a shell script")
+class FakeFFmpegTest(unittest.TestCase):
+    """Replace ffmpeg on PATH with a script, to check how its exit is handled."""
+
+    def use_ffmpeg(self, script: str) -> None:
+        bin_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(bin_dir.cleanup)
+        ffmpeg = Path(bin_dir.name) / "ffmpeg"
+        ffmpeg.write_text(f"#!/bin/sh\n{script}\n")
+        ffmpeg.chmod(0o755)
+        path = f"{bin_dir.name}{os.pathsep}{os.environ['PATH']}"
+        patcher = mock.patch.dict(os.environ, {"PATH": path})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failed_ffmpeg_is_not_ready(self):
+        self.use_ffmpeg("exit 1")
+        audio_source = StreamingPCMAudio("https://93.184.215.14/missing.mp3")
+        self.addCleanup(audio_source.cleanup)
+        self.assertFalse(audio_source.wait_until_ready(timeout=5))
+
+    def test_empty_output_is_not_ready(self):
+        self.use_ffmpeg("exit 0")
+        audio_source = StreamingPCMAudio("https://93.184.215.14/empty.mp3")
+        self.addCleanup(audio_source.cleanup)
+        self.assertFalse(audio_source.wait_until_ready(timeout=5))
+
+    def test_frames_play_until_end(self):
+        # 1000 frames and a partial one, more than the buffer holds
+        self.use_ffmpeg(f"head -c {FRAME_SIZE * 1000 + 10} /dev/zero")
+        audio_source = StreamingPCMAudio("long.mp3")
+        self.addCleanup(audio_source.cleanup)
+        self.assertTrue(audio_source.wait_until_ready(timeout=5))
+        frames = read_all(audio_source)
+        self.assertEqual(len(frames), 1001)
+        self.assertTrue(all(len(frame) == FRAME_SIZE for frame in frames))
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg is not installed")
+class HTTPStreamTest(unittest.TestCase):
+    """Stream from a local HTTP server with the real ffmpeg."""
+
+    def setUp(self):
+        serve_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(serve_dir.cleanup)
+        # 2 seconds of 48kHz stereo silence, 100 frames once decoded
+        with wave.open(str(Path(serve_dir.name) / "track.wav"), "wb") as f:
+            f.setnchannels(2)
+            f.setsampwidth(2)
+            f.setframerate(48000)
+            f.writeframes(b"\x00" * 48000 * 4 * 2)
+
+        handler = lambda *args: QuietHandler(*args, directory=serve_dir.name)  # noqa: E731
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_stream_plays_whole_track(self):
+        audio_source = StreamingPCMAudio(f"{self.base_url}/track.wav")
+        self.addCleanup(audio_source.cleanup)
+        self.assertTrue(audio_source.wait_until_ready())
+        self.assertEqual(len(read_all(audio_source)), 100)
+
+    def test_missing_track_is_not_ready(self):
+        audio_source = StreamingPCMAudio(f"{self.base_url}/missing.wav")
+        self.addCleanup(audio_source.cleanup)
+        self.assertFalse(audio_source.wait_until_ready())
+
+
+if __name__ == "__main__":
+    unittest.main()